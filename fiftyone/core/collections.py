@@ -1860,6 +1860,8 @@ class SampleCollection(object):
         use_masks=False,
         use_boxes=False,
         classwise=True,
+        num_workers=None,
+        store_matches=True,
         **kwargs,
     ):
         """Evaluates the specified predicted detections in this collection with
@@ -1936,6 +1938,14 @@ class SampleCollection(object):
                 instances rather than using their actual geometries
             classwise (True): whether to only match objects with the same class
                 label (True) or allow matches between classes (False)
+            num_workers (None): the number of processes to use when matching
+                objects. By default, matching is performed in the main process.
+                Only applicable to evaluation methods whose configs declare
+                their ``label_attributes``, such as COCO-style evaluation
+            store_matches (True): whether to accumulate the matched objects
+                in the returned results. If False, the returned results will
+                not contain any per-object data, which reduces memory usage
+                when only the fields populated via ``eval_key`` are needed
             **kwargs: optional keyword arguments for the constructor of the
                 :class:`fiftyone.utils.eval.detection.DetectionEvaluationConfig`
                 being used
@@ -1955,6 +1965,8 @@ class SampleCollection(object):
             use_masks=use_masks,
             use_boxes=use_boxes,
             classwise=classwise,
+            num_workers=num_workers,
+            store_matches=store_matches,
             **kwargs,
         )
 
@@ -1241,14 +1241,15 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
     def _delete_sample_fields(self, field_names, error_level):
         fields, embedded_fields = _parse_fields(field_names)
 
+        # All fields are deleted via a single database update
+        self._sample_doc_cls._delete_fields(
+            fields, error_level=error_level, embedded_fields=embedded_fields
+        )
+
         if fields:
-            self._sample_doc_cls._delete_fields(
-                fields, error_level=error_level
-            )
             fos.Sample._purge_fields(self._sample_collection_name, fields)
 
         if embedded_fields:
-            self._sample_doc_cls._delete_embedded_fields(embedded_fields)
             fos.Sample._reload_docs(self._sample_collection_name)
 
         self._reload()
@@ -1259,12 +1260,15 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         fields, embedded_fields = _parse_fields(field_names)
 
+        # All fields are deleted via a single database update
+        self._frame_doc_cls._delete_fields(
+            fields, error_level=error_level, embedded_fields=embedded_fields
+        )
+
         if fields:
-            self._frame_doc_cls._delete_fields(fields, error_level=error_level)
             fofr.Frame._purge_fields(self._frame_collection_name, fields)
 
         if embedded_fields:
-            self._frame_doc_cls._delete_embedded_fields(embedded_fields)
             fofr.Frame._reload_docs(self._frame_collection_name)
 
         self._reload()
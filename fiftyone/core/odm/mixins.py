@@ -562,7 +562,7 @@ class DatasetMixin(object):
         cls._clear_fields_collection(field_names, sample_collection)
 
     @classmethod
-    def _delete_fields(cls, field_names, error_level=0):
+    def _delete_fields(cls, field_names, error_level=0, embedded_fields=None):
         """Deletes the field(s) from the documents in this collection.
 
         Args:
@@ -572,6 +572,9 @@ class DatasetMixin(object):
             -   0: raise error if a field cannot be deleted
             -   1: log warning if a field cannot be deleted
             -   2: ignore fields that cannot be deleted
+
+            embedded_fields (None): an optional iterable of
+                "embedded.field.names" to delete in the same database update
         """
         default_fields = get_default_fields(
             cls.__bases__[0], include_private=True
@@ -595,25 +598,21 @@ class DatasetMixin(object):
             else:
                 _field_names.append(field_name)
 
-        if not _field_names:
-            return
-
         for field_name in _field_names:
             cls._delete_field_schema(field_name)
 
-        cls._delete_fields_simple(_field_names)
-
-    @classmethod
-    def _delete_embedded_fields(cls, field_names):
-        """Deletes the embedded field(s) from the documents in this collection.
+        if embedded_fields:
+            # Embedded fields of deleted fields are already covered, and
+            # unsetting both would be a path collision
+            roots = set(_field_names)
+            _field_names.extend(
+                f for f in embedded_fields if f.split(".", 1)[0] not in roots
+            )
 
-        Args:
-            field_names: an iterable of "embedded.field.names"
-        """
-        if not field_names:
+        if not _field_names:
             return
 
-        cls._delete_fields_simple(field_names)
+        cls._delete_fields_simple(_field_names)
 
     @classmethod
     def _rename_fields_simple(cls, field_names, new_field_names):
@@ -490,14 +490,19 @@ def _compute_confusion_matrix(
         return confusion_matrix, ids
 
     labels_to_inds = {label: idx for idx, label in enumerate(labels)}
-    ypred = np.array([labels_to_inds.get(y, -1) for y in ypred])
-    ytrue = np.array([labels_to_inds.get(y, -1) for y in ytrue])
+    ypred = _encode_labels(ypred, labels_to_inds)
+    ytrue = _encode_labels(ytrue, labels_to_inds)
 
     found = np.logical_and(ypred >= 0, ytrue >= 0)
     ypred = ypred[found]
     ytrue = ytrue[found]
     weights = weights[found]
 
+    np.add.at(confusion_matrix, (ytrue, ypred), weights)
+
+    if not tabulate_ids:
+        return confusion_matrix, ids
+
     if ytrue_ids is not None:
         ytrue_ids = ytrue_ids[found]
     else:
@@ -508,9 +513,7 @@ def _compute_confusion_matrix(
     else:
         ypred_ids = itertools.repeat(None)
 
-    for yt, yp, w, it, ip in zip(ytrue, ypred, weights, ytrue_ids, ypred_ids):
-        confusion_matrix[yt, yp] += w
-
+    for yt, yp, it, ip in zip(ytrue, ypred, ytrue_ids, ypred_ids):
         if it is not None:
             ids[yt, yp].append(it)
 
@@ -518,3 +521,12 @@ def _compute_confusion_matrix(
             ids[yt, yp].append(ip)
 
     return confusion_matrix, ids
+
+
+def _encode_labels(labels, labels_to_inds):
+    # Unknown labels are encoded as -1
+    return np.fromiter(
+        (labels_to_inds.get(y, -1) for y in labels),
+        dtype=int,
+        count=len(labels),
+    )
@@ -11,6 +11,7 @@ from collections import defaultdict
 import numpy as np
 
 import fiftyone.core.plots as fop
+import fiftyone.core.utils as fou
 
 from .detection import (
     DetectionEvaluation,
@@ -19,9 +20,11 @@ from .detection import (
 )
 from .utils import (
     compute_ious,
+    filter_predictions,
     make_iscrowd_fcn,
 )
 
+spo = fou.lazy_import("scipy.optimize")
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +42,22 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         iou (None): the IoU threshold to use to determine matches
         classwise (None): whether to only match objects with the same class
             label (True) or allow matches between classes (False)
+        confidence_thresh (None): an optional confidence threshold. If
+            provided, predicted objects whose confidence is below this value
+            (or is missing) are omitted from evaluation
+        max_class_preds (None): an optional maximum number of predicted
+            objects of each class to evaluate per sample/frame. If provided,
+            only the highest confidence predictions of each class are matched
+            and the rest are omitted from evaluation
         iscrowd ("iscrowd"): the name of the crowd attribute
+        matching ("greedy"): the strategy to use when matching predictions to
+            non-crowd ground truth objects. Supported values are:
+
+            -   ``"greedy"``: match predictions in descending order of
+                confidence to the highest IoU available ground truth object
+            -   ``"hungarian"``: choose the one-to-one assignment that
+                maximizes the total IoU of matched objects
+
         use_masks (False): whether to compute IoUs using the instances masks in
             the ``mask`` attribute of the provided objects, which must be
             :class:`fiftyone.core.labels.Detection` instances
@@ -72,7 +90,10 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         gt_field,
         iou=None,
         classwise=None,
+        confidence_thresh=None,
+        max_class_preds=None,
         iscrowd="iscrowd",
+        matching="greedy",
         use_masks=False,
         use_boxes=False,
         tolerance=None,
@@ -83,7 +104,13 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         **kwargs,
     ):
         super().__init__(
-            pred_field, gt_field, iou=iou, classwise=classwise, **kwargs
+            pred_field,
+            gt_field,
+            iou=iou,
+            classwise=classwise,
+            confidence_thresh=confidence_thresh,
+            max_class_preds=max_class_preds,
+            **kwargs,
         )
 
         if compute_mAP and iou_threshs is None:
@@ -93,6 +120,7 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
             max_preds = 100
 
         self.iscrowd = iscrowd
+        self.matching = matching
         self.use_masks = use_masks
         self.use_boxes = use_boxes
         self.tolerance = tolerance
@@ -105,6 +133,24 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
     def method(self):
         return "coco"
 
+    @property
+    def label_attributes(self):
+        attrs = [
+            "label",
+            "bounding_box",
+            "confidence",
+            "points",
+            "closed",
+            "filled",
+            "attributes",
+            self.iscrowd,
+        ]
+
+        if self.use_masks:
+            attrs.append("mask")
+
+        return attrs
+
 
 class COCOEvaluation(DetectionEvaluation):
     """COCO-style evaluation.
@@ -128,6 +174,12 @@ class COCOEvaluation(DetectionEvaluation):
                 "evaluation"
             )
 
+        if config.matching not in _MATCHING_STRATEGIES:
+            raise ValueError(
+                "Unsupported matching strategy '%s'. Supported values are %s"
+                % (config.matching, _MATCHING_STRATEGIES)
+            )
+
     def evaluate_image(self, sample_or_frame, eval_key=None):
         """Performs COCO-style evaluation on the given image.
 
@@ -455,6 +507,7 @@ class COCODetectionResults(DetectionResults):
 
 _NO_MATCH_ID = ""
 _NO_MATCH_IOU = None
+_MATCHING_STRATEGIES = ("greedy", "hungarian")
 
 
 def _coco_evaluation_single_iou(gts, preds, eval_key, config):
@@ -474,6 +527,7 @@ def _coco_evaluation_single_iou(gts, preds, eval_key, config):
         eval_key=eval_key,
         id_key=id_key,
         iou_key=iou_key,
+        matching=config.matching,
     )
 
     # omit iscrowd
@@ -498,6 +552,7 @@ def _coco_evaluation_iou_sweep(gts, preds, config):
             eval_key="eval",
             id_key=k,
             iou_key=iou_key,
+            matching=config.matching,
         )
         for i, k in zip(iou_threshs, id_keys)
     }
@@ -533,7 +588,11 @@ def _coco_evaluation_setup(
             cats[label]["gts"].append(obj)
 
     if preds is not None:
-        for obj in preds[preds._LABEL_LIST_FIELD]:
+        for obj in filter_predictions(
+            preds[preds._LABEL_LIST_FIELD],
+            confidence_thresh=config.confidence_thresh,
+            max_class_preds=config.max_class_preds,
+        ):
             obj[iou_key] = _NO_MATCH_IOU
             for id_key in id_keys:
                 obj[id_key] = _NO_MATCH_ID
@@ -569,7 +628,14 @@ def _coco_evaluation_setup(
 
 
 def _compute_matches(
-    cats, pred_ious, iou_thresh, iscrowd, eval_key, id_key, iou_key
+    cats,
+    pred_ious,
+    iou_thresh,
+    iscrowd,
+    eval_key,
+    id_key,
+    iou_key,
+    matching="greedy",
 ):
     matches = []
 
@@ -577,46 +643,40 @@ def _compute_matches(
     for cat, objects in cats.items():
         gt_map = {gt.id: gt for gt in objects["gts"]}
 
+        # Crowd statuses and matched GTs are tracked locally rather than via
+        # repeated label attribute lookups
+        gt_crowds = {gt_id: iscrowd(gt) for gt_id, gt in gt_map.items()}
+        matched_gt_ids = set()
+
+        if matching == "hungarian":
+            assignments = _compute_optimal_assignments(
+                objects["preds"], gt_map, gt_crowds, pred_ious, iou_thresh
+            )
+
         # Match each prediction to the highest available IoU ground truth
         for pred in objects["preds"]:
             if pred.id in pred_ious:
-                best_match = None
-                best_match_iou = iou_thresh
-                for gt_id, iou in pred_ious[pred.id]:
-                    gt = gt_map[gt_id]
-                    gt_iscrowd = iscrowd(gt)
-
-                    # Only iscrowd GTs can have multiple matches
-                    if gt[id_key] != _NO_MATCH_ID and not gt_iscrowd:
-                        continue
-
-                    # If matching classwise=False
-                    # Only objects with the same class can match a crowd
-                    if gt_iscrowd and gt.label != pred.label:
-                        continue
-
-                    # Crowds are last in order of GTs
-                    # If we already matched a non-crowd and are on a crowd,
-                    # then break
-                    if (
-                        best_match
-                        and not iscrowd(gt_map[best_match])
-                        and gt_iscrowd
-                    ):
-                        break
-
-                    if iou < best_match_iou:
-                        continue
-
-                    best_match_iou = iou
-                    best_match = gt_id
+                if matching == "hungarian":
+                    best_match, best_match_iou = assignments.get(
+                        pred.id, (None, None)
+                    )
+                else:
+                    best_match, best_match_iou = _compute_greedy_match(
+                        pred,
+                        gt_map,
+                        gt_crowds,
+                        matched_gt_ids,
+                        pred_ious,
+                        iou_thresh,
+                    )
 
                 if best_match:
                     gt = gt_map[best_match]
 
                     # For crowd GTs, record info for first (highest confidence)
                     # matching prediction on the GT object
-                    if gt[id_key] == _NO_MATCH_ID:
+                    if best_match not in matched_gt_ids:
+                        matched_gt_ids.add(best_match)
                         gt[eval_key] = "tp" if gt.label == pred.label else "fn"
                         gt[id_key] = pred.id
                         gt[iou_key] = best_match_iou
@@ -633,7 +693,7 @@ def _compute_matches(
                             pred.confidence,
                             gt.id,
                             pred.id,
-                            iscrowd(gt),
+                            gt_crowds[best_match],
                         )
                     )
                 else:
@@ -665,16 +725,91 @@ def _compute_matches(
                 )
 
         # Leftover GTs are false negatives
-        for gt in objects["gts"]:
-            if gt[id_key] == _NO_MATCH_ID:
+        for gt_id, gt in gt_map.items():
+            if gt_id not in matched_gt_ids:
                 gt[eval_key] = "fn"
                 matches.append(
-                    (gt.label, None, None, None, gt.id, None, iscrowd(gt))
+                    (gt.label, None, None, None, gt_id, None, gt_crowds[gt_id])
                 )
 
     return matches
 
 
+def _compute_greedy_match(
+    pred, gt_map, gt_crowds, matched_gt_ids, pred_ious, iou_thresh
+):
+    best_match = None
+    best_match_iou = iou_thresh
+    for gt_id, iou in pred_ious[pred.id]:
+        # Cheapest test first. Skipping a GT here never changes the result,
+        # since any crowd GTs that follow can't replace a non-crowd match
+        if iou < best_match_iou:
+            continue
+
+        gt_iscrowd = gt_crowds[gt_id]
+
+        # Only iscrowd GTs can have multiple matches
+        if gt_id in matched_gt_ids and not gt_iscrowd:
+            continue
+
+        # If matching classwise=False
+        # Only objects with the same class can match a crowd
+        if gt_iscrowd and gt_map[gt_id].label != pred.label:
+            continue
+
+        # Crowds are last in order of GTs
+        # If we already matched a non-crowd and are on a crowd,
+        # then break
+        if best_match and not gt_crowds[best_match] and gt_iscrowd:
+            break
+
+        best_match_iou = iou
+        best_match = gt_id
+
+    return best_match, best_match_iou
+
+
+def _compute_optimal_assignments(
+    preds, gt_map, gt_crowds, pred_ious, iou_thresh
+):
+    if not preds or not gt_map:
+        return {}
+
+    gt_ids = [gt_id for gt_id, _ in pred_ious[preds[0].id]]
+    ious = np.array([[iou for _, iou in pred_ious[p.id]] for p in preds])
+    crowds = np.array([gt_crowds[g] for g in gt_ids], dtype=bool)
+    valid = ious >= iou_thresh
+
+    assignments = {}
+
+    # Maximum total IoU one-to-one assignment to non-crowd GTs
+    inds = np.flatnonzero(~crowds)
+    if inds.size > 0:
+        weights = np.where(valid[:, inds], ious[:, inds], 0)
+        rows, cols = spo.linear_sum_assignment(weights, maximize=True)
+        for i, j in zip(rows, inds[cols]):
+            if valid[i, j]:
+                assignments[preds[i].id] = (gt_ids[j], ious[i, j])
+
+    # Unassigned preds may match the highest IoU crowd with the same label
+    for i, pred in enumerate(preds):
+        if pred.id in assignments:
+            continue
+
+        best_match = None
+        best_match_iou = iou_thresh
+        for j in np.flatnonzero(crowds):
+            gt = gt_map[gt_ids[j]]
+            if gt.label == pred.label and ious[i, j] >= best_match_iou:
+                best_match = gt.id
+                best_match_iou = ious[i, j]
+
+        if best_match:
+            assignments[pred.id] = (best_match, best_match_iou)
+
+    return assignments
+
+
 def _copy_labels(labels):
     if labels is None:
         return None
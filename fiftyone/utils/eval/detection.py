@@ -5,13 +5,18 @@ Detection evaluation.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
-import itertools
+import array
 import logging
+import math
+import multiprocessing
 
 import numpy as np
+from pymongo import UpdateOne
 
 import fiftyone.core.evaluation as foe
+from fiftyone.core.expressions import ViewField as F
 import fiftyone.core.fields as fof
+import fiftyone.core.frame as fofr
 import fiftyone.core.labels as fol
 import fiftyone.core.utils as fou
 import fiftyone.core.validation as fov
@@ -22,6 +27,9 @@ from .utils import compute_ious
 
 logger = logging.getLogger(__name__)
 
+_FRAMES_CHUNK_SIZE = 64
+_SAVE_BATCH_SIZE = 10000
+
 
 def evaluate_detections(
     samples,
@@ -35,6 +43,8 @@ def evaluate_detections(
     use_masks=False,
     use_boxes=False,
     classwise=True,
+    num_workers=None,
+    store_matches=True,
     **kwargs,
 ):
     """Evaluates the predicted detections in the given samples with respect to
@@ -109,6 +119,14 @@ def evaluate_detections(
             rather than using their actual geometries
         classwise (True): whether to only match objects with the same class
             label (True) or allow matches between classes (False)
+        num_workers (None): the number of processes to use when matching
+            objects. By default, matching is performed in the main process.
+            Only applicable to evaluation methods whose configs declare their
+            ``label_attributes``, such as COCO-style evaluation
+        store_matches (True): whether to accumulate the matched objects in the
+            returned results. If False, the returned results will not contain
+            any per-object data, which reduces memory usage when only the
+            fields populated via ``eval_key`` are needed
         **kwargs: optional keyword arguments for the constructor of the
             :class:`DetectionEvaluationConfig` being used
 
@@ -144,17 +162,10 @@ def evaluate_detections(
     eval_method.register_run(samples, eval_key)
     eval_method.register_samples(samples)
 
-    if not config.requires_additional_fields:
-        _samples = samples.select_fields([gt_field, pred_field])
-    else:
-        _samples = samples
-
     processing_frames = samples._is_frame_field(pred_field)
 
     if eval_key is not None:
-        tp_field = "%s_tp" % eval_key
-        fp_field = "%s_fp" % eval_key
-        fn_field = "%s_fn" % eval_key
+        tp_field, fp_field, fn_field = _get_count_fields(eval_key)
 
         # note: fields are manually declared so they'll exist even when
         # `samples` is empty
@@ -167,37 +178,63 @@ def evaluate_detections(
             dataset._add_frame_field_if_necessary(fp_field, fof.IntField)
             dataset._add_frame_field_if_necessary(fn_field, fof.IntField)
 
-    matches = []
-    logger.info("Evaluating detections...")
-    for sample in _samples.iter_samples(progress=True):
-        if processing_frames:
-            images = sample.frames.values()
+    if num_workers is None:
+        num_workers = 1
+
+    # Samples that contain no objects have nothing to match, so we skip them
+    has_objects = _make_has_objects_expr(samples, config, processing_frames)
+    if processing_frames:
+        # Filtering frames requires a `$lookup`, so we resolve the matching
+        # sample IDs once rather than re-running it for every later pass
+        eval_ids = samples.match(has_objects).values("id")
+        eval_samples = samples.select(eval_ids)
+        empty_samples = samples.exclude(eval_ids)
+    else:
+        eval_samples = samples.match(has_objects)
+        empty_samples = samples.match(~has_objects)
+
+    use_raw_labels = _uses_raw_labels(samples, config)
+    if num_workers > 1 and not use_raw_labels:
+        if samples._dataset is not samples._root_dataset:
+            msg = (
+                "num_workers is not supported on generated views; "
+                "evaluating in a single process"
+            )
+        elif config.requires_additional_fields:
+            msg = (
+                "num_workers is not supported by evaluation methods that "
+                "require additional fields; evaluating in a single process"
+            )
         else:
-            images = [sample]
-
-        sample_tp = 0
-        sample_fp = 0
-        sample_fn = 0
-        for image in images:
-            image_matches = eval_method.evaluate_image(
-                image, eval_key=eval_key
+            msg = (
+                "num_workers is not supported by evaluation methods that do "
+                "not declare their label attributes; evaluating in a single "
+                "process"
             )
-            matches.extend(image_matches)
-            tp, fp, fn = _tally_matches(image_matches)
-            sample_tp += tp
-            sample_fp += fp
-            sample_fn += fn
 
-            if processing_frames and eval_key is not None:
-                image[tp_field] = tp
-                image[fp_field] = fp
-                image[fn_field] = fn
+        logger.warning(msg)
 
-        if eval_key is not None:
-            sample[tp_field] = sample_tp
-            sample[fp_field] = sample_fp
-            sample[fn_field] = sample_fn
-            sample.save()
+    logger.info("Evaluating detections...")
+    if num_workers > 1 and use_raw_labels:
+        matches = _evaluate_samples_multi(
+            eval_samples,
+            eval_method,
+            eval_key,
+            processing_frames,
+            store_matches,
+            num_workers,
+        )
+    else:
+        matches = _evaluate_samples(
+            eval_samples,
+            eval_method,
+            eval_key,
+            processing_frames,
+            store_matches,
+        )
+
+    if eval_key is not None:
+        _save_empty_results(empty_samples, eval_key, processing_frames)
 
     results = eval_method.generate_results(
         samples, matches, eval_key=eval_key, classes=classes, missing=missing
@@ -276,16 +313,32 @@ class DetectionEvaluationConfig(foe.EvaluationMethodConfig):
         iou (None): the IoU threshold to use to determine matches
         classwise (None): whether to only match objects with the same class
             label (True) or allow matches between classes (False)
+        confidence_thresh (None): an optional confidence threshold. If
+            provided, predicted objects whose confidence is below this value
+            (or is missing) are omitted from evaluation before matching
+        max_class_preds (None): an optional maximum number of predicted
+            objects of each class to evaluate per sample/frame. If provided,
+            only the highest confidence predictions of each class are matched
+            and the rest are omitted from evaluation
     """
 
     def __init__(
-        self, pred_field, gt_field, iou=None, classwise=None, **kwargs
+        self,
+        pred_field,
+        gt_field,
+        iou=None,
+        classwise=None,
+        confidence_thresh=None,
+        max_class_preds=None,
+        **kwargs,
     ):
         super().__init__(**kwargs)
         self.pred_field = pred_field
         self.gt_field = gt_field
         self.iou = iou
         self.classwise = classwise
+        self.confidence_thresh = confidence_thresh
+        self.max_class_preds = max_class_preds
 
     @property
     def requires_additional_fields(self):
@@ -298,6 +351,21 @@ class DetectionEvaluationConfig(foe.EvaluationMethodConfig):
         """
         return False
 
+    @property
+    def label_attributes(self):
+        """The list of attributes of the ground truth and predicted objects
+        that are required in order to perform evaluation, or None if the full
+        samples/frames are required.
+
+        If provided (and :meth:`requires_additional_fields` is False), only
+        these attributes (and the objects' IDs) are loaded from the database,
+        and :meth:`DetectionEvaluation.evaluate_image` is passed lightweight
+        frames that contain only the ground truth and predicted objects. In
+        this case, only the ``eval_key``, ``eval_key_id``, and
+        ``eval_key_iou`` attributes of the objects are saved.
+        """
+        return None
+
 
 class DetectionEvaluation(foe.EvaluationMethod):
     """Base class for detection evaluation methods.
@@ -330,6 +398,14 @@ class DetectionEvaluation(foe.EvaluationMethod):
     def evaluate_image(self, sample_or_frame, eval_key=None):
         """Evaluates the ground truth and predicted objects in an image.
 
+        If the config provides
+        :meth:`DetectionEvaluationConfig.label_attributes`, the provided
+        image is a :class:`fiftyone.core.frame.Frame` that only contains the
+        ground truth and predicted objects, loaded with only those attributes,
+        and only the ``eval_key``, ``eval_key_id``, and ``eval_key_iou``
+        attributes that this method sets on the objects are saved. Otherwise,
+        the full sample or frame is provided and saved.
+
         Args:
             sample_or_frame: a :class:`fiftyone.core.Sample` or
                 :class:`fiftyone.core.frame.Frame`
@@ -484,7 +560,16 @@ class DetectionResults(BaseEvaluationResults):
         missing=None,
         samples=None,
     ):
-        if matches:
+        if isinstance(matches, (_MatchesBuffer, _MatchColumns)):
+            (
+                ytrue,
+                ypred,
+                ious,
+                confs,
+                ytrue_ids,
+                ypred_ids,
+            ) = matches.to_arrays()
+        elif matches:
             ytrue, ypred, ious, confs, ytrue_ids, ypred_ids = zip(*matches)
         else:
             ytrue, ypred, ious, confs, ytrue_ids, ypred_ids = (
@@ -516,18 +601,19 @@ class DetectionResults(BaseEvaluationResults):
         ytrue = d["ytrue"]
         ypred = d["ypred"]
         ious = d["ious"]
+        num_matches = len(ytrue)
 
         confs = d.get("confs", None)
         if confs is None:
-            confs = itertools.repeat(None)
+            confs = [None] * num_matches
 
         ytrue_ids = d.get("ytrue_ids", None)
         if ytrue_ids is None:
-            ytrue_ids = itertools.repeat(None)
+            ytrue_ids = [None] * num_matches
 
         ypred_ids = d.get("ypred_ids", None)
         if ypred_ids is None:
-            ypred_ids = itertools.repeat(None)
+            ypred_ids = [None] * num_matches
 
         eval_key = d.get("eval_key", None)
         gt_field = d.get("gt_field", None)
@@ -535,7 +621,11 @@ class DetectionResults(BaseEvaluationResults):
         classes = d.get("classes", None)
         missing = d.get("missing", None)
 
-        matches = list(zip(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids))
+        # The stored columns are passed directly rather than being zipped into
+        # tuples that the constructor would then transpose back
+        matches = _MatchColumns(
+            ytrue, ypred, ious, confs, ytrue_ids, ypred_ids
+        )
 
         return cls(
             matches,
@@ -549,6 +639,620 @@ class DetectionResults(BaseEvaluationResults):
         )
 
 
+class _MatchColumns(object):
+    """Wraps ``(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids)`` columns so
+    that they can be passed to :class:`DetectionResults` as ``matches``.
+
+    Iterating over the instance yields the matches as tuples.
+    """
+
+    def __init__(self, ytrue, ypred, ious, confs, ytrue_ids, ypred_ids):
+        self._columns = (ytrue, ypred, ious, confs, ytrue_ids, ypred_ids)
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __iter__(self):
+        return zip(*self._columns)
+
+    def to_arrays(self):
+        """Returns the ``(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids)``
+        columns.
+
+        Returns:
+            a tuple of columns
+        """
+        return self._columns
+
+
+class _MatchesBuffer(object):
+    """Accumulates ``(gt_label, pred_label, iou, pred_confidence, gt_id,
+    pred_id)`` matches in typed column buffers.
+
+    Labels are stored as integer codes and IoUs/confidences as packed floats,
+    which is far more compact than a list of tuples for large evaluations.
+    Iterating over the buffer yields the matches as tuples.
+    """
+
+    def __init__(self):
+        self._classes = []
+        self._codes = {}
+        self._ytrue = array.array("i")
+        self._ypred = array.array("i")
+        self._ious = array.array("d")
+        self._confs = array.array("d")
+        self._ytrue_ids = []
+        self._ypred_ids = []
+
+    def __len__(self):
+        return len(self._ytrue)
+
+    def __iter__(self):
+        labels = self._classes + [None]  # code -1 is `None`
+        for ytrue, ypred, iou, conf, ytrue_id, ypred_id in zip(
+            self._ytrue,
+            self._ypred,
+            self._ious,
+            self._confs,
+            self._ytrue_ids,
+            self._ypred_ids,
+        ):
+            yield (
+                labels[ytrue],
+                labels[ypred],
+                None if math.isnan(iou) else iou,
+                None if math.isnan(conf) else conf,
+                ytrue_id,
+                ypred_id,
+            )
+
+    def extend(self, matches):
+        """Adds the given matches to the buffer.
+
+        Args:
+            matches: an iterable of
+                ``(gt_label, pred_label, iou, pred_confidence, gt_id,
+                pred_id)`` tuples
+        """
+        for ytrue, ypred, iou, conf, ytrue_id, ypred_id in matches:
+            self._ytrue.append(self._encode(ytrue))
+            self._ypred.append(self._encode(ypred))
+            self._ious.append(math.nan if iou is None else iou)
+            self._confs.append(math.nan if conf is None else conf)
+            self._ytrue_ids.append(ytrue_id)
+            self._ypred_ids.append(ypred_id)
+
+    def to_arrays(self):
+        """Returns the matches as a tuple of
+        ``(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids)`` object arrays.
+
+        Returns:
+            a tuple of arrays
+        """
+        labels = np.array(self._classes + [None], dtype=object)
+        ytrue = labels[np.array(self._ytrue, dtype=int)]
+        ypred = labels[np.array(self._ypred, dtype=int)]
+        ious = _decode_floats(self._ious)
+        confs = _decode_floats(self._confs)
+        ytrue_ids = np.array(self._ytrue_ids, dtype=object)
+        ypred_ids = np.array(self._ypred_ids, dtype=object)
+        return ytrue, ypred, ious, confs, ytrue_ids, ypred_ids
+
+    def _encode(self, label):
+        if label is None:
+            return -1
+
+        code = self._codes.get(label, None)
+        if code is None:
+            code = len(self._classes)
+            self._codes[label] = code
+            self._classes.append(label)
+
+        return code
+
+
+def _decode_floats(values):
+    values = np.array(values, dtype=float)
+    decoded = values.astype(object)
+    decoded[np.isnan(values)] = None
+    return decoded
+
+
+def _uses_raw_labels(samples, config):
+    # Generated views (patches, frames, clips) must sync edits to their source
+    # collections, which happens when their full samples are saved
+    return (
+        not config.requires_additional_fields
+        and config.label_attributes is not None
+        and samples._dataset is samples._root_dataset
+    )
+
+
+def _evaluate_samples(
+    samples, eval_method, eval_key, processing_frames, store_matches
+):
+    config = eval_method.config
+
+    if not _uses_raw_labels(samples, config):
+        return _evaluate_full_samples(
+            samples, eval_method, eval_key, processing_frames, store_matches
+        )
+
+    label_type = samples._get_label_field_type(config.gt_field)
+    eval_attrs = _get_eval_attributes(eval_key)
+
+    if eval_key is not None:
+        writer = _ResultsWriter(
+            samples, eval_method, eval_key, processing_frames
+        )
+    else:
+        writer = None
+
+    matches = _MatchesBuffer()
+    with fou.ProgressBar(total=len(samples)) as pb:
+        for sample_id, images in pb(
+            _iter_raw_labels(samples, config, processing_frames)
+        ):
+            image_matches, image_results = _evaluate_images(
+                eval_method,
+                label_type,
+                images,
+                eval_key,
+                eval_attrs,
+                store_matches,
+            )
+            matches.extend(image_matches)
+
+            if writer is not None:
+                writer.save_images(image_results)
+                if processing_frames:
+                    writer.save_sample_counts(
+                        sample_id, *_sum_counts(image_results)
+                    )
+
+    if writer is not None:
+        writer.close()
+
+    return matches
+
+
+def _evaluate_full_samples(
+    samples, eval_method, eval_key, processing_frames, store_matches
+):
+    # The evaluation method may use any sample/frame fields or set arbitrary
+    # attributes, so full documents are evaluated and saved
+    config = eval_method.config
+
+    if not config.requires_additional_fields:
+        samples = samples.select_fields([config.gt_field, config.pred_field])
+
+    if eval_key is not None:
+        tp_field, fp_field, fn_field = _get_count_fields(eval_key)
+
+    matches = _MatchesBuffer()
+    for sample in samples.iter_samples(progress=True):
+        if processing_frames:
+            images = sample.frames.values()
+        else:
+            images = [sample]
+
+        sample_tp = 0
+        sample_fp = 0
+        sample_fn = 0
+        for image in images:
+            image_matches = eval_method.evaluate_image(
+                image, eval_key=eval_key
+            )
+            if store_matches:
+                matches.extend(image_matches)
+
+            tp, fp, fn = _tally_matches(image_matches)
+            sample_tp += tp
+            sample_fp += fp
+            sample_fn += fn
+
+            if processing_frames and eval_key is not None:
+                image[tp_field] = tp
+                image[fp_field] = fp
+                image[fn_field] = fn
+
+        if eval_key is not None:
+            sample[tp_field] = sample_tp
+            sample[fp_field] = sample_fp
+            sample[fn_field] = sample_fn
+            sample.save()
+
+    return matches
+
+
+def _evaluate_samples_multi(
+    samples,
+    eval_method,
+    eval_key,
+    processing_frames,
+    store_matches,
+    num_workers,
+):
+    config = eval_method.config
+    label_type = samples._get_label_field_type(config.gt_field)
+    eval_attrs = _get_eval_attributes(eval_key)
+
+    if eval_key is not None:
+        writer = _ResultsWriter(
+            samples, eval_method, eval_key, processing_frames
+        )
+    else:
+        writer = None
+
+    # Labels are streamed from the database cursor to the workers rather
+    # than being loaded into memory up front. Videos are split into chunks of
+    # frames so that long videos are spread across the workers
+    num_chunks = {}
+
+    def _make_inputs():
+        for idx, (sample_id, images) in enumerate(
+            _iter_raw_labels(samples, config, processing_frames)
+        ):
+            starts = range(0, max(len(images), 1), _FRAMES_CHUNK_SIZE)
+            num_chunks[idx] = len(starts)
+            for start in starts:
+                yield (
+                    idx,
+                    start,
+                    sample_id,
+                    eval_method,
+                    eval_key,
+                    eval_attrs,
+                    store_matches,
+                    label_type,
+                    images[start : start + _FRAMES_CHUNK_SIZE],
+                )
+
+    matches = _MatchesBuffer()
+    pending = {}
+    next_idx = 0
+    with fou.ProgressBar(total=len(samples)) as pb:
+        with multiprocessing.Pool(processes=num_workers) as pool:
+            for (
+                idx,
+                start,
+                sample_id,
+                image_matches,
+                image_results,
+            ) in pool.imap_unordered(
+                _do_evaluate_sample, _make_inputs(), chunksize=32
+            ):
+                if writer is not None:
+                    writer.save_images(image_results)
+
+                chunks = pending.setdefault(idx, [])
+                chunks.append(
+                    (start, image_matches, _sum_counts(image_results))
+                )
+                if len(chunks) < num_chunks[idx]:
+                    continue
+
+                pb.update()
+
+                if writer is not None and processing_frames:
+                    counts = [c for _, _, c in chunks]
+                    writer.save_sample_counts(
+                        sample_id, *(sum(c) for c in zip(*counts))
+                    )
+
+                # Matches are recorded in sample order so that the results
+                # don't depend on the order in which the workers finish
+                while len(pending.get(next_idx, [])) == num_chunks.get(
+                    next_idx, -1
+                ):
+                    for _, chunk_matches, _ in sorted(
+                        pending.pop(next_idx), key=lambda c: c[0]
+                    ):
+                        matches.extend(chunk_matches)
+
+                    next_idx += 1
+
+    if writer is not None:
+        writer.close()
+
+    return matches
+
+
+def _make_has_objects_expr(samples, config, processing_frames):
+    gt_field, _ = samples._handle_frame_field(config.gt_field)
+    pred_field, _ = samples._handle_frame_field(config.pred_field)
+    label_type = samples._get_label_field_type(config.gt_field)
+    list_field = label_type._LABEL_LIST_FIELD
+
+    has_objects = (F(gt_field + "." + list_field).length() > 0) | (
+        F(pred_field + "." + list_field).length() > 0
+    )
+
+    if processing_frames:
+        has_objects = F("frames").filter(has_objects).length() > 0
+
+    return has_objects
+
+
+def _save_empty_results(samples, eval_key, processing_frames):
+    fields = _get_count_fields(eval_key)
+
+    if processing_frames:
+        frame_ids = samples.values("frames.id")
+        frame_zeros = [[0] * len(_frame_ids) for _frame_ids in frame_ids]
+        zeros = [0] * len(frame_ids)
+        for field in fields:
+            samples.set_values(samples._FRAMES_PREFIX + field, frame_zeros)
+            samples.set_values(field, zeros)
+    else:
+        zeros = [0] * len(samples)
+        for field in fields:
+            samples.set_values(field, zeros)
+
+
+def _iter_raw_labels(samples, config, processing_frames):
+    # Only the label attributes needed for matching are loaded from the
+    # database, which avoids loading heavy attributes like instance masks
+    gt_field, _ = samples._handle_frame_field(config.gt_field)
+    pred_field, _ = samples._handle_frame_field(config.pred_field)
+    label_type = samples._get_label_field_type(config.gt_field)
+    list_field = label_type._LABEL_LIST_FIELD
+
+    attrs = ["_id", "_cls"] + [
+        a for a in config.label_attributes if a not in ("id", "_id")
+    ]
+    paths = []
+    for field in (gt_field, pred_field):
+        paths.append(field + "._cls")
+        paths.extend("%s.%s.%s" % (field, list_field, a) for a in attrs)
+
+    if processing_frames:
+        prefix = samples._FRAMES_PREFIX
+        paths = [prefix + "_id"] + [prefix + p for p in paths]
+
+    pipeline = [{"$project": {p: True for p in paths}}]
+
+    for d in samples._aggregate(
+        pipeline=pipeline, attach_frames=processing_frames
+    ):
+        if processing_frames:
+            images = d.get("frames", [])
+        else:
+            images = [d]
+
+        yield d["_id"], [
+            (i["_id"], i.get(gt_field, None), i.get(pred_field, None))
+            for i in images
+        ]
+
+
+class _ResultsWriter(object):
+    """Saves the results of a detection evaluation to the database.
+
+    Each evaluated sample (or frame) is updated via a single ``UpdateOne``
+    operation that sets its TP/FP/FN counts and the evaluation attributes of
+    its objects. Objects are targeted via ``arrayFilters`` on their IDs, so
+    objects that are not in the evaluated collection are left untouched.
+
+    Operations are written in batches as they are generated.
+    """
+
+    def __init__(self, samples, eval_method, eval_key, processing_frames):
+        label_type = samples._get_label_field_type(eval_method.config.gt_field)
+        list_field = label_type._LABEL_LIST_FIELD
+
+        self._dataset = samples._dataset
+        self._processing_frames = processing_frames
+        self._count_fields = _get_count_fields(eval_key)
+        self._eval_attrs = _get_eval_attributes(eval_key)
+        self._list_paths = (
+            eval_method.gt_field + "." + list_field,
+            eval_method.pred_field + "." + list_field,
+        )
+        self._sample_ops = []
+        self._frame_ops = []
+
+    def save_images(self, image_results):
+        """Saves the results for the given images, which are frames when
+        processing frames and samples otherwise.
+
+        Args:
+            image_results: a list of
+                ``(image_id, tp, fp, fn, gt_values, pred_values)`` tuples
+        """
+        if self._processing_frames:
+            ops = self._frame_ops
+        else:
+            ops = self._sample_ops
+
+        for image_id, tp, fp, fn, gt_values, pred_values in image_results:
+            ops.append(
+                self._make_op(image_id, (tp, fp, fn), (gt_values, pred_values))
+            )
+
+        self._write_if_necessary()
+
+    def save_sample_counts(self, sample_id, tp, fp, fn):
+        """Saves the TP/FP/FN counts of a video sample.
+
+        Args:
+            sample_id: the sample ID
+            tp: the number of true positives
+            fp: the number of false positives
+            fn: the number of false negatives
+        """
+        update = dict(zip(self._count_fields, (tp, fp, fn)))
+        self._sample_ops.append(
+            UpdateOne({"_id": sample_id}, {"$set": update})
+        )
+        self._write_if_necessary()
+
+    def close(self):
+        """Writes any pending operations."""
+        self._write()
+
+    def _make_op(self, _id, counts, all_values):
+        update = dict(zip(self._count_fields, counts))
+
+        # MongoDB rejects updates in which multiple array filters match the
+        # same element, so each distinct object gets a single filter. When
+        # an object appears more than once (e.g., when a field is evaluated
+        # against itself), its last values win
+        filter_names = {}
+        for path, values in zip(self._list_paths, all_values):
+            if not values:
+                continue
+
+            for obj_id, obj_values in values:
+                if obj_id is None:
+                    continue
+
+                key = (path, obj_id)
+                name = filter_names.get(key, None)
+                if name is None:
+                    name = "o%d" % len(filter_names)
+
+                obj_update = {
+                    "%s.$[%s].%s" % (path, name, attr): value
+                    for attr, value in zip(self._eval_attrs, obj_values)
+                    if value is not None
+                }
+
+                # Every array filter must be used by the update
+                if obj_update:
+                    filter_names[key] = name
+                    update.update(obj_update)
+
+        array_filters = [
+            {name + "._id": obj_id}
+            for (_, obj_id), name in filter_names.items()
+        ]
+
+        return UpdateOne(
+            {"_id": _id},
+            {"$set": update},
+            array_filters=array_filters or None,
+        )
+
+    def _write_if_necessary(self):
+        num_ops = len(self._sample_ops) + len(self._frame_ops)
+        if num_ops >= _SAVE_BATCH_SIZE:
+            self._write()
+
+    def _write(self):
+        if self._frame_ops:
+            self._dataset._bulk_write(self._frame_ops, frames=True)
+            self._frame_ops = []
+
+        if self._sample_ops:
+            self._dataset._bulk_write(self._sample_ops)
+            self._sample_ops = []
+
+
+def _sum_counts(image_results):
+    tp = sum(r[1] for r in image_results)
+    fp = sum(r[2] for r in image_results)
+    fn = sum(r[3] for r in image_results)
+    return tp, fp, fn
+
+
+def _do_evaluate_sample(args):
+    (
+        idx,
+        start,
+        sample_id,
+        eval_method,
+        eval_key,
+        eval_attrs,
+        store_matches,
+        label_type,
+        images,
+    ) = args
+
+    image_matches, image_results = _evaluate_images(
+        eval_method, label_type, images, eval_key, eval_attrs, store_matches
+    )
+
+    return idx, start, sample_id, image_matches, image_results
+
+
+def _evaluate_images(
+    eval_method, label_type, images, eval_key, eval_attrs, store_matches
+):
+    matches = []
+    image_results = []
+    for image_id, gts, preds in images:
+        image = _make_image(eval_method, label_type, gts, preds)
+        image_matches = eval_method.evaluate_image(image, eval_key=eval_key)
+        tp, fp, fn = _tally_matches(image_matches)
+
+        # Avoid accumulating matches (or sending them back to the main
+        # process) if they'll be unused
+        if store_matches:
+            matches.extend(image_matches)
+
+        # Only the per-object evaluation attributes are retained, so that
+        # label objects needn't be kept in memory or sent back from workers
+        if eval_attrs is not None:
+            gt_values = _get_eval_values(
+                image[eval_method.gt_field], eval_attrs
+            )
+            pred_values = _get_eval_values(
+                image[eval_method.pred_field], eval_attrs
+            )
+        else:
+            gt_values = None
+            pred_values = None
+
+        image_results.append((image_id, tp, fp, fn, gt_values, pred_values))
+
+    return matches, image_results
+
+
+def _make_image(eval_method, label_type, gts, preds):
+    return fofr.Frame(
+        **{
+            eval_method.gt_field: _from_dict(gts, label_type),
+            eval_method.pred_field: _from_dict(preds, label_type),
+        }
+    )
+
+
+def _from_dict(d, label_type):
+    if d is None:
+        return None
+
+    return label_type.from_dict(d)
+
+
+def _get_eval_attributes(eval_key):
+    if eval_key is None:
+        return None
+
+    return eval_key, "%s_id" % eval_key, "%s_iou" % eval_key
+
+
+def _get_count_fields(eval_key):
+    return "%s_tp" % eval_key, "%s_fp" % eval_key, "%s_fn" % eval_key
+
+
+def _get_eval_values(labels, eval_attrs):
+    if labels is None:
+        return None
+
+    objects = labels[labels._LABEL_LIST_FIELD]
+    return [
+        (
+            obj._id,
+            [
+                obj.get_field(a) if obj.has_field(a) else None
+                for a in eval_attrs
+            ],
+        )
+        for obj in objects
+    ]
+
+
 def _parse_config(pred_field, gt_field, method, **kwargs):
     if method is None:
         method = "coco"
@@ -567,6 +1271,8 @@ def _parse_config(pred_field, gt_field, method, **kwargs):
 
 
 def _tally_matches(matches):
+    # A single pass in Python is faster here than building NumPy arrays,
+    # since per-image match lists are small
     tp = 0
     fp = 0
     fn = 0
@@ -19,6 +19,7 @@ from .detection import (
 )
 from .utils import (
     compute_ious,
+    filter_predictions,
     make_iscrowd_fcn,
 )
 
@@ -36,6 +37,13 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
         iou (None): the IoU threshold to use to determine matches
         classwise (None): whether to only match objects with the same class
             label (True) or allow matches between classes (False)
+        confidence_thresh (None): an optional confidence threshold. If
+            provided, predicted objects whose confidence is below this value
+            (or is missing) are omitted from evaluation
+        max_class_preds (None): an optional maximum number of predicted
+            objects of each class to evaluate per sample/frame. If provided,
+            only the highest confidence predictions of each class are matched
+            and the rest are omitted from evaluation
         iscrowd ("IsGroupOf"): the name of the crowd attribute
         use_masks (False): whether to compute IoUs using the instances masks in
             the ``mask`` attribute of the provided objects, which must be
@@ -77,6 +85,8 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
         gt_field,
         iou=None,
         classwise=None,
+        confidence_thresh=None,
+        max_class_preds=None,
         iscrowd="IsGroupOf",
         use_masks=False,
         use_boxes=False,
@@ -91,7 +101,13 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
         **kwargs
     ):
         super().__init__(
-            pred_field, gt_field, iou=iou, classwise=classwise, **kwargs
+            pred_field,
+            gt_field,
+            iou=iou,
+            classwise=classwise,
+            confidence_thresh=confidence_thresh,
+            max_class_preds=max_class_preds,
+            **kwargs,
         )
 
         self.iscrowd = iscrowd
@@ -582,7 +598,11 @@ def _open_images_evaluation_setup(
                     _expand_detection_hierarchy(cats, obj, config, "gts")
 
     if preds is not None:
-        for obj in preds[preds._LABEL_LIST_FIELD]:
+        for obj in filter_predictions(
+            preds[preds._LABEL_LIST_FIELD],
+            confidence_thresh=config.confidence_thresh,
+            max_class_preds=config.max_class_preds,
+        ):
             if relevant_labs is None or obj.label in relevant_labs:
                 obj[iou_key] = _NO_MATCH_IOU
                 obj[id_key] = _NO_MATCH_ID
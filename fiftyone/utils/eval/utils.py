@@ -5,6 +5,7 @@ Evaluation utilities.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import defaultdict
 import contextlib
 import logging
 
@@ -34,6 +35,48 @@ def make_iscrowd_fcn(iscrowd_attr):
     return lambda label: bool(label.get_attribute_value(iscrowd_attr, False))
 
 
+def filter_predictions(preds, confidence_thresh=None, max_class_preds=None):
+    """Filters the given predicted objects by confidence.
+
+    Args:
+        preds: a list of predicted :class:`fiftyone.core.labels.Detection` or
+            :class:`fiftyone.core.labels.Polyline` instances
+        confidence_thresh (None): an optional confidence threshold. If
+            provided, objects whose confidence is below this value (or is
+            missing) are omitted
+        max_class_preds (None): an optional maximum number of objects of each
+            class to keep. If provided, only the highest confidence objects of
+            each class are kept
+
+    Returns:
+        a list of the objects that were kept, in their original order
+    """
+    if confidence_thresh is not None:
+        preds = [
+            p
+            for p in preds
+            if p.confidence is not None and p.confidence >= confidence_thresh
+        ]
+
+    if max_class_preds is None:
+        return preds
+
+    class_preds = defaultdict(list)
+    for idx, pred in enumerate(preds):
+        class_preds[pred.label].append((idx, pred))
+
+    keep = set()
+    for objects in class_preds.values():
+        if len(objects) > max_class_preds:
+            objects = sorted(
+                objects, key=lambda o: o[1].confidence or -1, reverse=True
+            )[:max_class_preds]
+
+        keep.update(idx for idx, _ in objects)
+
+    return [pred for idx, pred in enumerate(preds) if idx in keep]
+
+
 def compute_ious(
     preds,
     gts,
@@ -125,42 +168,49 @@ def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
     else:
         gt_crowds = [False] * num_gt
 
+    # When computing self-IoUs, only compute boxes and areas once
+    is_self = gts is preds
+
     if isinstance(preds[0], fol.Polyline):
         preds = _polylines_to_detections(preds)
-        gts = _polylines_to_detections(gts)
+        gts = preds if is_self else _polylines_to_detections(gts)
 
-    ious = np.zeros((len(preds), len(gts)))
-    for j, (gt, gt_crowd) in enumerate(zip(gts, gt_crowds)):
-        gx, gy, gw, gh = gt.bounding_box
-        gt_area = gh * gw
+    pred_boxes, pred_areas = _to_bbox_arrays(preds)
+    if is_self:
+        gt_boxes, gt_areas = pred_boxes, pred_areas
+    else:
+        gt_boxes, gt_areas = _to_bbox_arrays(gts)
 
-        for i, pred in enumerate(preds):
-            if classwise and pred.label != gt.label:
-                continue
+    # Intersections of all (pred, gt) pairs
+    tl = np.maximum(pred_boxes[:, None, :2], gt_boxes[None, :, :2])
+    br = np.minimum(pred_boxes[:, None, 2:], gt_boxes[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
 
-            px, py, pw, ph = pred.bounding_box
-            pred_area = ph * pw
+    union = pred_areas[:, None] + gt_areas[None, :] - inter
+    gt_crowds = np.asarray(gt_crowds, dtype=bool)
+    if gt_crowds.any():
+        union[:, gt_crowds] = pred_areas[:, None]
 
-            # Width of intersection
-            w = min(px + pw, gx + gw) - max(px, gx)
-            if w <= 0:
-                continue
+    ious = np.zeros((num_pred, num_gt))
+    np.divide(inter, union, out=ious, where=(inter > 0) & (union != 0))
+    np.minimum(ious, 1, out=ious)
 
-            # Height of intersection
-            h = min(py + ph, gy + gh) - max(py, gy)
-            if h <= 0:
-                continue
+    if classwise:
+        pred_labels = np.array([pred.label for pred in preds], dtype=object)
+        gt_labels = np.array([gt.label for gt in gts], dtype=object)
+        ious[pred_labels[:, None] != gt_labels[None, :]] = 0
 
-            inter = h * w
+    return ious
 
-            if gt_crowd:
-                union = pred_area
-            else:
-                union = pred_area + gt_area - inter
 
-            ious[i, j] = min(etan.safe_divide(inter, union), 1)
-
-    return ious
+def _to_bbox_arrays(detections):
+    # Returns an `N x 4` array of `[x1, y1, x2, y2]` boxes and their areas
+    boxes = np.array(
+        [d.bounding_box for d in detections], dtype=float
+    ).reshape(-1, 4)
+    areas = boxes[:, 2] * boxes[:, 3]
+    boxes[:, 2:] += boxes[:, :2]
+    return boxes, areas
 
 
 def _compute_polyline_ious(
@@ -181,15 +231,25 @@ def _compute_polyline_ious(
         pred_areas = [pred_poly.area for pred_poly in pred_polys]
 
         num_gt = len(gts)
-        gt_polys = _polylines_to_shapely(gts, error_level)
-        gt_labels = [gt.label for gt in gts]
-        gt_areas = [gt_poly.area for gt_poly in gt_polys]
+        if gts is preds:
+            # Self-IoUs, so reuse the geometries and areas
+            gt_polys = pred_polys
+            gt_labels = pred_labels
+            gt_areas = pred_areas
+        else:
+            gt_polys = _polylines_to_shapely(gts, error_level)
+            gt_labels = [gt.label for gt in gts]
+            gt_areas = [gt_poly.area for gt_poly in gt_polys]
 
         if iscrowd is not None:
             gt_crowds = [iscrowd(gt) for gt in gts]
         elif gt_crowds is None:
             gt_crowds = [False] * num_gt
 
+        # Objects whose bounds don't overlap can't have positive IoU, so we
+        # can skip computing their intersections
+        overlaps = _compute_bounds_overlaps(pred_polys, gt_polys)
+
         ious = np.zeros((num_pred, num_gt))
         for j, (gt_poly, gt_label, gt_area, gt_crowd) in enumerate(
             zip(gt_polys, gt_labels, gt_areas, gt_crowds)
@@ -200,6 +260,9 @@ def _compute_polyline_ious(
                 if classwise and pred_label != gt_label:
                     continue
 
+                if not overlaps[i, j]:
+                    continue
+
                 try:
                     inter = gt_poly.intersection(pred_poly).area
                 except Exception as e:
@@ -224,6 +287,27 @@ def _compute_polyline_ious(
         return ious
 
 
+def _compute_bounds_overlaps(pred_polys, gt_polys):
+    pred_bounds = _get_shapely_bounds(pred_polys)
+    gt_bounds = _get_shapely_bounds(gt_polys)
+
+    # NaN bounds (empty geometries) never overlap anything
+    pmin = pred_bounds[:, None, :2]
+    pmax = pred_bounds[:, None, 2:]
+    gmin = gt_bounds[None, :, :2]
+    gmax = gt_bounds[None, :, 2:]
+    return np.all((pmin < gmax) & (gmin < pmax), axis=2)
+
+
+def _get_shapely_bounds(polys):
+    bounds = np.full((len(polys), 4), np.nan)
+    for idx, poly in enumerate(polys):
+        if not poly.is_empty:
+            bounds[idx] = poly.bounds
+
+    return bounds
+
+
 def _compute_mask_ious(
     preds, gts, tolerance, error_level, iscrowd=None, classwise=False
 ):
@@ -237,7 +321,10 @@ def _compute_mask_ious(
             )
 
         pred_polys = _masks_to_polylines(preds, tolerance, error_level)
-        gt_polys = _masks_to_polylines(gts, tolerance, error_level)
+        if gts is preds:
+            gt_polys = pred_polys
+        else:
+            gt_polys = _masks_to_polylines(gts, tolerance, error_level)
 
     if iscrowd is not None:
         gt_crowds = [iscrowd(gt) for gt in gts]
@@ -975,6 +975,31 @@ class DatasetTests(unittest.TestCase):
         with self.assertRaises(AttributeError):
             sample.predictions.new_field
 
+    @drop_datasets
+    def test_delete_fields(self):
+        dataset = fo.Dataset()
+        sample = fo.Sample(
+            filepath="image.jpg",
+            field=1,
+            predictions=fo.Classification(label="friend", field=1, other=2),
+            other=fo.Classification(label="foe", field=1),
+        )
+        dataset.add_sample(sample)
+
+        # Top-level and embedded fields, including an embedded field of a
+        # deleted top-level field
+        dataset.delete_sample_fields(
+            ["field", "predictions.field", "other", "other.field"]
+        )
+
+        schema = dataset.get_field_schema()
+        self.assertNotIn("field", schema)
+        self.assertNotIn("other", schema)
+        self.assertEqual(sample.predictions.label, "friend")
+        self.assertEqual(sample.predictions.other, 2)
+        with self.assertRaises(AttributeError):
+            sample.predictions.field
+
     @drop_datasets
     def test_classes(self):
         dataset = fo.Dataset()
@@ -11,6 +11,8 @@ import warnings
 import numpy as np
 
 import fiftyone as fo
+from fiftyone import ViewField as F
+import fiftyone.utils.eval.detection as foud
 
 from decorators import drop_datasets
 
@@ -1341,6 +1343,298 @@ class DetectionsTests(unittest.TestCase):
 
         self._evaluate_coco(dataset, kwargs)
 
+    @drop_datasets
+    def test_evaluate_detections_coco_multi(self):
+        dataset = self._make_detections_dataset()
+        kwargs = dict(num_workers=2)
+
+        self._evaluate_coco(dataset, kwargs)
+
+    @drop_datasets
+    def test_evaluate_detections_confidence_thresh(self):
+        dataset = self._make_detections_dataset()
+
+        dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            method="coco",
+            confidence_thresh=0.95,
+        )
+
+        _, pred_eval_field = dataset._get_label_field_path(
+            "predictions", "eval"
+        )
+
+        # All predictions have confidence 0.9, so none are evaluated
+        self.assertListEqual(
+            dataset.values(pred_eval_field),
+            [None, None, [None], [None], [None]],
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 0, 0])
+        self.assertListEqual(dataset.values("eval_fp"), [0, 0, 0, 0, 0])
+        self.assertListEqual(dataset.values("eval_fn"), [0, 1, 0, 1, 1])
+
+    @drop_datasets
+    def test_evaluate_detections_max_class_preds(self):
+        dataset = fo.Dataset()
+        dataset.add_sample(
+            fo.Sample(
+                filepath="image.jpg",
+                ground_truth=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4]
+                        )
+                    ]
+                ),
+                predictions=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.1, 0.1, 0.4, 0.4],
+                            confidence=0.5,
+                        ),
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.6, 0.6, 0.3, 0.3],
+                            confidence=0.8,
+                        ),
+                        fo.Detection(
+                            label="dog",
+                            bounding_box=[0.1, 0.1, 0.4, 0.4],
+                            confidence=0.3,
+                        ),
+                    ]
+                ),
+            )
+        )
+
+        for method in ("coco", "open-images"):
+            dataset.evaluate_detections(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval",
+                method=method,
+            )
+            self.assertListEqual(dataset.values("eval_tp"), [1])
+            self.assertListEqual(dataset.values("eval_fp"), [2])
+
+            # Only the highest confidence prediction of each class is matched
+            dataset.evaluate_detections(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval",
+                method=method,
+                max_class_preds=1,
+            )
+            self.assertListEqual(
+                dataset.values("predictions.detections.eval"),
+                [[None, "fp", "fp"]],
+            )
+            self.assertListEqual(dataset.values("eval_tp"), [0])
+            self.assertListEqual(dataset.values("eval_fp"), [2])
+            self.assertListEqual(dataset.values("eval_fn"), [1])
+
+            dataset.delete_evaluation("eval")
+
+    @drop_datasets
+    def test_evaluate_detections_coco_hungarian(self):
+        dataset = fo.Dataset()
+        dataset.add_sample(
+            fo.Sample(
+                filepath="image.jpg",
+                ground_truth=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat", bounding_box=[0.0, 0.0, 0.4, 0.4]
+                        ),
+                        fo.Detection(
+                            label="cat", bounding_box=[0.2, 0.0, 0.4, 0.4]
+                        ),
+                    ]
+                ),
+                predictions=fo.Detections(
+                    detections=[
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.15, 0.0, 0.4, 0.4],
+                            confidence=0.9,
+                        ),
+                        fo.Detection(
+                            label="cat",
+                            bounding_box=[0.3, 0.0, 0.4, 0.4],
+                            confidence=0.8,
+                        ),
+                    ]
+                ),
+            )
+        )
+
+        # Greedy matching assigns the first prediction to the second ground
+        # truth object, leaving nothing for the second prediction
+        dataset.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval", iou=0.4
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [1])
+
+        dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            iou=0.4,
+            matching="hungarian",
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [2])
+        self.assertListEqual(dataset.values("eval_fp"), [0])
+        self.assertListEqual(dataset.values("eval_fn"), [0])
+
+    @drop_datasets
+    def test_evaluate_detections_no_store_matches(self):
+        dataset = self._make_detections_dataset()
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            store_matches=False,
+        )
+
+        self.assertEqual(results.ytrue.size, 0)
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 1, 0])
+        self.assertListEqual(dataset.values("eval_fp"), [0, 0, 1, 0, 1])
+        self.assertListEqual(dataset.values("eval_fn"), [0, 1, 0, 0, 1])
+
+    @drop_datasets
+    def test_evaluate_detections_preserves_attributes(self):
+        dataset = self._make_instances_dataset()
+
+        num_masks = dataset.count("ground_truth.detections.mask")
+        self.assertGreater(num_masks, 0)
+
+        # Masks are not loaded when not evaluating instances, and they must
+        # not be overwritten when the evaluation results are saved
+        dataset.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval"
+        )
+
+        self.assertEqual(
+            dataset.count("ground_truth.detections.mask"), num_masks
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 1, 0])
+
+    @drop_datasets
+    def test_evaluate_detections_self(self):
+        for num_workers in (1, 2):
+            dataset = self._make_detections_dataset()
+
+            dataset.evaluate_detections(
+                "predictions",
+                gt_field="predictions",
+                eval_key="eval",
+                num_workers=num_workers,
+            )
+
+            self.assertListEqual(
+                dataset.values("predictions.detections.eval"),
+                [None, None, ["tp"], ["tp"], ["tp"]],
+            )
+            self.assertListEqual(
+                dataset.values("predictions.detections.eval_id"),
+                dataset.values("predictions.detections.id"),
+            )
+            self.assertListEqual(dataset.values("eval_tp"), [0, 0, 1, 1, 1])
+            self.assertListEqual(dataset.values("eval_fp"), [0, 0, 0, 0, 0])
+            self.assertListEqual(dataset.values("eval_fn"), [0, 0, 0, 0, 0])
+
+    @drop_datasets
+    def test_evaluate_detections_duplicate_ids(self):
+        dataset = fo.Dataset()
+
+        gt = fo.Detection(label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4])
+        pred = fo.Detection(
+            label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4], confidence=0.9
+        )
+        dataset.add_sample(
+            fo.Sample(
+                filepath="image.jpg",
+                ground_truth=fo.Detections(detections=[gt]),
+                predictions=fo.Detections(detections=[pred, pred]),
+            )
+        )
+
+        dataset.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval"
+        )
+
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval"), [["tp"]]
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [1])
+        self.assertListEqual(dataset.values("eval_fp"), [1])
+        self.assertListEqual(dataset.values("eval_fn"), [0])
+
+    @drop_datasets
+    def test_evaluate_detections_filtered_view(self):
+        dataset = self._make_detections_dataset()
+        sample = dataset.last()
+        sample.predictions.detections.append(
+            fo.Detection(
+                label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4], confidence=0.2
+            )
+        )
+        sample.save()
+
+        # Objects that are excluded from the view must not be modified
+        view = dataset.filter_labels(
+            "predictions", F("confidence") > 0.5, only_matches=False
+        )
+        view.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval"
+        )
+
+        self.assertListEqual(
+            dataset.values("predictions.detections.eval"),
+            [None, None, ["fp"], ["tp"], ["fp", None]],
+        )
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval"),
+            [None, ["fn"], None, ["tp"], ["fn"]],
+        )
+        self.assertListEqual(dataset.values("eval_tp"), [0, 0, 0, 1, 0])
+        self.assertListEqual(dataset.values("eval_fp"), [0, 0, 1, 0, 1])
+
+    @drop_datasets
+    def test_detection_results_from_dict(self):
+        dataset = self._make_detections_dataset()
+
+        dataset.evaluate_detections(
+            "predictions", gt_field="ground_truth", eval_key="eval"
+        )
+
+        results = dataset.load_evaluation_results("eval")
+        config = dataset.get_evaluation_info("eval").config
+        d = results.serialize()
+
+        results2 = results.from_dict(d, dataset, config)
+        self.assertListEqual(results2.ytrue.tolist(), results.ytrue.tolist())
+        self.assertListEqual(results2.ypred.tolist(), results.ypred.tolist())
+        self.assertListEqual(results2.ious.tolist(), results.ious.tolist())
+        self.assertListEqual(results2.confs.tolist(), results.confs.tolist())
+        self.assertListEqual(
+            results2.ytrue_ids.tolist(), results.ytrue_ids.tolist()
+        )
+
+        # Results serialized before confidences and IDs were stored
+        for key in ("confs", "ytrue_ids", "ypred_ids"):
+            d.pop(key)
+
+        results3 = results.from_dict(d, dataset, config)
+        self.assertListEqual(results3.ytrue.tolist(), results.ytrue.tolist())
+        self.assertListEqual(
+            results3.confs.tolist(), [None] * len(results.ytrue)
+        )
+
     @drop_datasets
     def test_evaluate_instances_coco(self):
         dataset = self._make_instances_dataset()
@@ -1603,6 +1897,42 @@ class VideoDetectionsTests(unittest.TestCase):
             dataset.values("frames.eval_fn"), [[], [0], [1, 0], [0, 1]],
         )
 
+    def test_evaluate_video_detections_multi(self):
+        dataset = self._make_video_detections_dataset()
+
+        kwargs = dict(gt_field="frames.ground_truth", method="coco", iou=0.5)
+
+        dataset.evaluate_detections(
+            "frames.predictions", eval_key="serial", **kwargs
+        )
+
+        # Split every video into single-frame chunks so that the frames of
+        # a video are evaluated across multiple workers
+        chunk_size = foud._FRAMES_CHUNK_SIZE
+        foud._FRAMES_CHUNK_SIZE = 1
+        try:
+            dataset.evaluate_detections(
+                "frames.predictions", eval_key="multi", num_workers=2, **kwargs
+            )
+        finally:
+            foud._FRAMES_CHUNK_SIZE = chunk_size
+
+        self.assertListEqual(
+            dataset.values("frames.serial_tp"), [[], [0], [0, 0], [1, 0]],
+        )
+
+        fields = ["%s_tp", "%s_fp", "%s_fn"]
+        fields += ["frames." + f for f in fields]
+        for path in ("predictions", "ground_truth"):
+            for attr in ("%s", "%s_id", "%s_iou"):
+                fields.append("frames.%s.detections.%s" % (path, attr))
+
+        for field in fields:
+            self.assertListEqual(
+                dataset.values(field % "serial"),
+                dataset.values(field % "multi"),
+            )
+
     def test_evaluate_video_detections_open_images(self):
         dataset = self._make_video_detections_dataset()
 